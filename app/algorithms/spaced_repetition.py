@@ -14,10 +14,16 @@ in app/static/js/script.js, specifically the handleAction function (lines 407-47
 """
 
 import random
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, field
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Tuple, Any
+from dataclasses import dataclass, field, fields
 import json
 import os
+import tempfile
+
+# Compact encoder for state files; save_state streams item states through it in batches
+_STATE_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
 
 
 class LearningStep:
@@ -54,6 +60,9 @@ class ItemState:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ItemState':
         """Create ItemState from dictionary."""
+        if data.keys() == _ITEM_STATE_KEYS:
+            # Exactly the to_dict() keys: map them straight onto the constructor
+            return cls(**data)
         return cls(
             item_id=data['item_id'],
             review_count=data.get('review_count', 0),
@@ -65,6 +74,10 @@ class ItemState:
         )
 
 
+# Field names of ItemState, i.e. the keys written by ItemState.to_dict()
+_ITEM_STATE_KEYS = frozenset(f.name for f in fields(ItemState))
+
+
 class SpacedRepetitionEngine:
     """
     Spaced repetition engine implementing the EXACT algorithm from JavaScript.
@@ -73,20 +86,29 @@ class SpacedRepetitionEngine:
     spaced repetition algorithm logic identically to the JavaScript version.
     """
 
+    # ItemState fields that update_review_state may overwrite (item_id is fixed)
+    _UPDATABLE_FIELDS = frozenset({
+        'review_count', 'consecutive_correct', 'learning_step',
+        'mastered', 'wrong_count', 'correct_count'
+    })
+    # Number of item states encoded per write when streaming state to disk
+    _SAVE_BATCH_SIZE = 1024
+
     def __init__(self):
         """Initialize the spaced repetition engine (matches JavaScript initialization)."""
         self.item_states: Dict[str, ItemState] = {}  # Maps ID -> ItemState (questionMap in JS)
-        self.dynamic_sequence: List[str] = []        # Dynamic sequence of item IDs
+        self.dynamic_sequence: Deque[str] = deque()  # Dynamic sequence of item IDs (O(1) pop from front)
         self.mastered_items_count: int = 0           # Count of mastered items
         self.total_items_count: int = 0              # Total number of items
 
     def _get_random_interval(self) -> int:
         """Generate random interval between 8-12 (inclusive). Matches JavaScript getRandomInterval()."""
-        return random.randint(8, 12)  # Math.floor(Math.random() * 5) + 8
+        # Same formula as JS; avoids random.randint's argument checking and rejection sampling
+        return int(random.random() * 5) + 8  # Math.floor(Math.random() * 5) + 8
 
     def _get_long_random_interval(self) -> int:
         """Generate longer random interval between 15-20 (inclusive). Matches JavaScript getLongRandomInterval()."""
-        return random.randint(15, 20)  # Math.floor(Math.random() * 6) + 15
+        return int(random.random() * 6) + 15  # Math.floor(Math.random() * 6) + 15
 
     def initialize_from_items(self, items: List[Dict[str, Any]], saved_states: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -99,8 +121,8 @@ class SpacedRepetitionEngine:
         """
         # Clear existing data
         self.item_states.clear()
-        self.dynamic_sequence.clear()
         self.mastered_items_count = 0
+        sequence = []
 
         # Convert saved_states to map if provided
         saved_map = {}
@@ -117,24 +139,26 @@ class SpacedRepetitionEngine:
         for item in items:
             item_id = item['id']
 
-            # Check for saved state
-            saved_state = saved_map.get(item_id) if saved_map else None
-
             # Create question object with saved state or defaults
-            question_obj = ItemState(
-                item_id=item_id,
-                review_count=saved_state.get('_reviewCount', 0) if saved_state else 0,
-                consecutive_correct=saved_state.get('_consecutiveCorrect', 0) if saved_state else 0,
-                learning_step=saved_state.get('_learningStep', LearningStep.INITIAL) if saved_state else LearningStep.INITIAL,
-                mastered=saved_state.get('_mastered', False) if saved_state else False,
-                wrong_count=saved_state.get('_wrongCount', 0) if saved_state else 0,
-                correct_count=saved_state.get('_correctCount', 0) if saved_state else 0
-            )
+            saved_state = saved_map.get(item_id)
+            if saved_state is None:
+                question_obj = ItemState(item_id=item_id)
+            else:
+                get = saved_state.get
+                question_obj = ItemState(
+                    item_id=item_id,
+                    review_count=get('_reviewCount', 0),
+                    consecutive_correct=get('_consecutiveCorrect', 0),
+                    learning_step=get('_learningStep', LearningStep.INITIAL),
+                    mastered=get('_mastered', False),
+                    wrong_count=get('_wrongCount', 0),
+                    correct_count=get('_correctCount', 0)
+                )
 
             self.item_states[item_id] = question_obj
             # Only add non-mastered items to the dynamic sequence
             if not question_obj.mastered:
-                self.dynamic_sequence.append(item_id)
+                sequence.append(item_id)
 
         self.total_items_count = len(items)
 
@@ -148,13 +172,15 @@ class SpacedRepetitionEngine:
             saved_seq = [item_id for item_id in saved_states['dynamicSequence']
                         if item_id in self.item_states]
             if saved_seq:
-                self.dynamic_sequence = saved_seq
+                sequence = saved_seq
             else:
                 # Randomize initial sequence
-                random.shuffle(self.dynamic_sequence)
+                random.shuffle(sequence)
         else:
             # Randomize initial sequence
-            random.shuffle(self.dynamic_sequence)
+            random.shuffle(sequence)
+
+        self.dynamic_sequence = deque(sequence)
 
     def handle_review_action(self, item_id: str, action: str) -> Dict[str, Any]:
         """
@@ -171,17 +197,24 @@ class SpacedRepetitionEngine:
                 - action_processed: Description of the action taken
                 - next_item_id: Next item to review (from dynamic sequence)
         """
-        if item_id not in self.item_states:
+        state = self.item_states.get(item_id)
+        if state is None:
             raise ValueError(f"Item {item_id} not found in engine")
 
-        state = self.item_states[item_id]
+        # Validate the action before touching any state
+        if action not in ('recognized', 'forgotten'):
+            raise ValueError(f"Invalid action: {action}. Must be 'recognized' or 'forgotten'")
 
         # Remove item from current position in sequence (matches JS line 413: dynamicSequence.shift())
-        if self.dynamic_sequence and self.dynamic_sequence[0] == item_id:
-            self.dynamic_sequence.pop(0)
-        elif item_id in self.dynamic_sequence:
+        sequence = self.dynamic_sequence
+        if sequence and sequence[0] == item_id:
+            sequence.popleft()
+        else:
             # Fallback: remove the item if it's not at position 0
-            self.dynamic_sequence.remove(item_id)
+            try:
+                sequence.remove(item_id)
+            except ValueError:
+                pass
 
         # Increment review count (matches JS line 416)
         state.review_count += 1
@@ -254,9 +287,6 @@ class SpacedRepetitionEngine:
             result['action_processed'] = 'forgotten_reset_to_step1'
             result['next_item_id'] = self.dynamic_sequence[0] if self.dynamic_sequence else None
 
-        else:
-            raise ValueError(f"Invalid action: {action}. Must be 'recognized' or 'forgotten'")
-
         return result
 
     def get_next_item(self) -> Optional[str]:
@@ -276,17 +306,17 @@ class SpacedRepetitionEngine:
             item_id: ID of the item to update
             new_state: Dictionary containing new state values
         """
-        if item_id not in self.item_states:
-            self.item_states[item_id] = ItemState(item_id=item_id)
-
-        state = self.item_states[item_id]
+        state = self.item_states.get(item_id)
+        if state is None:
+            state = self.item_states[item_id] = ItemState(item_id=item_id)
 
         # Save old mastered state before updating fields
         old_mastered = state.mastered if 'mastered' in new_state else None
 
         # Update fields from new_state
+        updatable = self._UPDATABLE_FIELDS
         for key, value in new_state.items():
-            if hasattr(state, key):
+            if key in updatable:
                 setattr(state, key, value)
 
         # Update mastered items count if mastered status changed
@@ -335,7 +365,7 @@ class SpacedRepetitionEngine:
         """
         return {
             'item_states': {item_id: state.to_dict() for item_id, state in self.item_states.items()},
-            'dynamic_sequence': self.dynamic_sequence.copy(),
+            'dynamic_sequence': list(self.dynamic_sequence),
             'mastered_items_count': self.mastered_items_count,
             'total_items_count': self.total_items_count
         }
@@ -352,7 +382,7 @@ class SpacedRepetitionEngine:
             New SpacedRepetitionEngine instance
         """
         engine = cls()
-        engine.dynamic_sequence = data.get('dynamic_sequence', [])
+        engine.dynamic_sequence = deque(data.get('dynamic_sequence', []))
         engine.mastered_items_count = data.get('mastered_items_count', 0)
         engine.total_items_count = data.get('total_items_count', 0)
 
@@ -365,11 +395,51 @@ class SpacedRepetitionEngine:
 
     # Convenience methods for backward compatibility
     def save_state(self, file_path: str) -> None:
-        """Save engine state to JSON file."""
-        state_data = self.to_serializable()
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(state_data, f, ensure_ascii=False, indent=2)
+        """
+        Save engine state to JSON file (compact encoding, no indentation).
+
+        The state is written to a uniquely named temporary file in the same
+        directory, flushed and fsynced, and then moved over the target with
+        os.replace, so a crash mid-write never leaves a truncated state file
+        behind. The temporary file is removed if the write or the move fails.
+
+        The output is the same as json.dump(self.to_serializable()) with
+        ensure_ascii=False and compact separators=(',', ':'), but item states
+        are converted, encoded and written in batches instead of first being
+        collected into one large dictionary.
+        """
+        state_dir = os.path.dirname(file_path)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+        # Same directory as the target, so os.replace stays a rename on one filesystem
+        fd, tmp_path = tempfile.mkstemp(dir=state_dir or os.curdir, suffix='.tmp')
+        encode = _STATE_ENCODER.encode
+        item_states = iter(self.item_states.items())
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write('{"item_states":{')
+                separator = ''
+                while True:
+                    batch = {item_id: state.to_dict()
+                             for item_id, state in islice(item_states, self._SAVE_BATCH_SIZE)}
+                    if not batch:
+                        break
+                    f.write(separator)
+                    f.write(encode(batch)[1:-1])  # Strip the batch's own braces
+                    separator = ','
+                f.write('},')
+                f.write(encode({
+                    'dynamic_sequence': list(self.dynamic_sequence),
+                    'mastered_items_count': self.mastered_items_count,
+                    'total_items_count': self.total_items_count
+                })[1:])
+                # Make sure the data is on disk before the rename makes it visible
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
 
     def load_state(self, file_path: str) -> bool:
         """Load engine state from JSON file."""
@@ -415,7 +485,8 @@ class SpacedRepetitionEngine:
                 - removed_items_count: Number of items removed (no longer in file)
         """
         file_item_ids = {item['id'] for item in file_items}
-        current_item_ids = set(self.item_states.keys())
+        # Set difference on the keys view, taken before new items are added (no full copy of the keys)
+        removed_items = self.item_states.keys() - file_item_ids
 
         # Add new items
         new_items = []
@@ -430,21 +501,21 @@ class SpacedRepetitionEngine:
                 self.dynamic_sequence.append(item_id)
 
         # Remove items no longer in file
-        removed_items = current_item_ids - file_item_ids
         removed_count = 0
         for item_id in removed_items:
-            if item_id in self.item_states:
-                # Remove from item states
-                state = self.item_states[item_id]
+            # Remove from item states
+            state = self.item_states.pop(item_id, None)
+            if state is not None:
                 # Decrease counter if item was mastered
                 if state.mastered and self.mastered_items_count > 0:
                     self.mastered_items_count -= 1
-                del self.item_states[item_id]
                 removed_count += 1
 
-            # Remove from dynamic sequence
-            if item_id in self.dynamic_sequence:
-                self.dynamic_sequence.remove(item_id)
+        # Remove from dynamic sequence in one pass (set membership instead of a deque scan per item)
+        if removed_items:
+            self.dynamic_sequence = deque(
+                item_id for item_id in self.dynamic_sequence if item_id not in removed_items
+            )
 
         # Update total items count
         self.total_items_count = len(self.item_states)
@@ -462,8 +533,8 @@ class SpacedRepetitionEngine:
         # Filter out mastered items
         sequence_ids = []
         for item_id in item_ids:
-            if item_id in self.item_states:
-                state = self.item_states[item_id]
+            state = self.item_states.get(item_id)
+            if state is not None:
                 if not state.mastered:
                     sequence_ids.append(item_id)
             else:
@@ -471,9 +542,8 @@ class SpacedRepetitionEngine:
                 self.item_states[item_id] = ItemState(item_id=item_id)
                 sequence_ids.append(item_id)
 
-        self.dynamic_sequence = sequence_ids
         if shuffle:
-            import random
-            random.shuffle(self.dynamic_sequence)
+            random.shuffle(sequence_ids)
+        self.dynamic_sequence = deque(sequence_ids)
 
 
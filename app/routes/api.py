@@ -3,13 +3,24 @@ API routes for Reviewer Intense application.
 """
 
 import os
+import re
+import time
 import hashlib
 import json
+import secrets
+import string
 from flask import Blueprint, request, jsonify, current_app
+from .review import invalidate_knowledge_base
 
 # Create API blueprint
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
+# Alphabet for random ID suffixes: A-Za-z0-9
+_ID_ALPHABET = string.ascii_letters + string.digits
+
+# Allowed knowledge base filenames
+_FILENAME_RE = re.compile(r'^[a-zA-Z0-9_\-\.]+$')
+
 
 def generate_content_hash(question, answer):
     """Generates a hash based on Q/A content, used for initial ID generation."""
@@ -21,17 +32,12 @@ def generate_content_hash(question, answer):
 
 def generate_random_id():
     """Generate a unique random ID with timestamp prefix to prevent collisions."""
-    import time
-    import secrets
-    import string
-
     # Millisecond timestamp ensures uniqueness across different moments
     timestamp = str(int(time.time() * 1000))
 
     # Cryptographically secure random suffix (6 alphanumeric characters)
     # 62^6 ≈ 56 billion possible combinations
-    alphabet = string.ascii_letters + string.digits  # A-Za-z0-9
-    random_chars = ''.join(secrets.choice(alphabet) for _ in range(6))
+    random_chars = ''.join(secrets.choice(_ID_ALPHABET) for _ in range(6))
 
     # Format: timestamp_random (e.g., "1740281234_aB3dE7")
     return f"{timestamp}_{random_chars}"
@@ -47,7 +53,12 @@ def list_files():
         os.makedirs(KNOWLEDGE_DIR)
         print(f"📁 Creating directory: {KNOWLEDGE_DIR}")
 
-    files = [f for f in os.listdir(KNOWLEDGE_DIR) if f.endswith('.json')]
+    # Only regular files: directories named *.json are skipped, since they cannot be
+    # loaded as knowledge bases. scandir reports the entry type from the directory
+    # listing, so the filter needs no os.path.isfile() stat per entry.
+    with os.scandir(KNOWLEDGE_DIR) as entries:
+        files = [entry.name for entry in entries
+                 if entry.name.endswith('.json') and entry.is_file()]
     print(f"📄 Scanned {len(files)} JSON files: {files}")
 
     # 不再检查是否有待复习的题目，因为每次都从零开始
@@ -114,6 +125,7 @@ def load_data():
         if data_modified:
             with open(json_path, 'w', encoding='utf-8') as f:
                 json.dump(raw_data, f, ensure_ascii=False, indent=2)
+            invalidate_knowledge_base(json_path)
             print(f"   💾 Added IDs to {len(items)} items and saved to {file_name}")
 
         print(f"   📊 Loaded {len(items)} items from {file_name}.")
@@ -178,6 +190,7 @@ def update_item():
         # 写回文件
         with open(json_path, 'w', encoding='utf-8') as f:
             json.dump(raw_data, f, ensure_ascii=False, indent=2)
+        invalidate_knowledge_base(json_path)
 
         print(f"✅ Updated item in {file_name}: {item_id}")
         return jsonify({"success": True, "new_id": item_id})  # 返回原来的ID
@@ -201,8 +214,7 @@ def create_knowledge_base():
             file_name += '.json'
 
         # Validate filename
-        import re
-        if not re.match(r'^[a-zA-Z0-9_\-\.]+$', file_name):
+        if not _FILENAME_RE.match(file_name):
             return jsonify({"success": False, "error": "Invalid filename. Only letters, numbers, hyphens, underscores, and dots allowed."}), 400
 
         json_path = os.path.join(KNOWLEDGE_DIR, file_name)
@@ -217,6 +229,7 @@ def create_knowledge_base():
         # Create empty JSON array
         with open(json_path, 'w', encoding='utf-8') as f:
             json.dump([], f, ensure_ascii=False, indent=2)
+        invalidate_knowledge_base(json_path)
 
         print(f"✅ Created new knowledge base: {file_name}")
         return jsonify({"success": True, "file_name": file_name})
@@ -269,6 +282,7 @@ def save_all_items():
         # Write to file
         with open(json_path, 'w', encoding='utf-8') as f:
             json.dump(processed_items, f, ensure_ascii=False, indent=2)
+        invalidate_knowledge_base(json_path)
 
         print(f"✅ Saved {len(processed_items)} items to {file_name}")
         return jsonify({"success": True, "count": len(processed_items)})
@@ -4,7 +4,7 @@ Serves frontend pages and static files.
 """
 
 import os
-from flask import Blueprint, send_from_directory, current_app
+from flask import Blueprint, send_from_directory, current_app, redirect
 
 # Create main blueprint (no URL prefix for main routes)
 main_bp = Blueprint('main', __name__)
@@ -43,7 +43,6 @@ def serve_new_kb():
 @main_bp.route('/file-selector')
 def serve_file_selector():
     """Serve the file-selector.html page (legacy, redirect to home)."""
-    from flask import redirect
     return redirect('/')
 
 
@@ -7,6 +7,9 @@ Handles review actions and state management, implementing the
 
 import os
 import json
+import secrets
+import threading
+from collections import OrderedDict
 from flask import Blueprint, request, jsonify, current_app, session
 from ..algorithms.spaced_repetition import SpacedRepetitionEngine
 
@@ -15,6 +18,161 @@ review_bp = Blueprint('review', __name__, url_prefix='/api')
 
 # No state manager needed for one-time program
 
+# Parsed knowledge base files keyed by path: (file signature, items, items_by_id).
+# Entries are reused until the file's mtime or size changes; least recently used
+# files are evicted beyond KB_CACHE_SIZE.
+KB_CACHE_SIZE = 16
+_kb_cache = OrderedDict()
+_kb_cache_lock = threading.Lock()
+# Per-file locks so concurrent cache misses on one file parse it once, while
+# different files still load in parallel. A path's lock is dropped together with
+# its cache entry, or after a failed load, so this never outgrows the cache.
+_kb_load_locks = {}
+
+
+def _get_cached_knowledge_base(json_path: str, signature: tuple):
+    """Return the cache entry for json_path if it matches signature, else None."""
+    with _kb_cache_lock:
+        cached = _kb_cache.get(json_path)
+        if cached is not None and cached[0] == signature:
+            _kb_cache.move_to_end(json_path)
+            return cached
+    return None
+
+
+def _get_kb_load_lock(json_path: str) -> threading.Lock:
+    """Get the lock serializing loads of one knowledge base file."""
+    with _kb_cache_lock:
+        lock = _kb_load_locks.get(json_path)
+        if lock is None:
+            lock = _kb_load_locks[json_path] = threading.Lock()
+        return lock
+
+
+def load_knowledge_base(knowledge_file: str):
+    """
+    Load a knowledge base file, reusing the parsed copy while the file is unchanged.
+
+    Returns:
+        tuple: (items, items_by_id) - the raw JSON root and an ID -> item index
+        (first occurrence wins). Both are shared and must not be modified.
+    """
+    knowledge_dir = current_app.config.get('KNOWLEDGE_DIR', 'D:\\knowledge_bases')
+    json_path = os.path.join(knowledge_dir, knowledge_file)
+
+    stat = os.stat(json_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _get_cached_knowledge_base(json_path, signature)
+    if cached is not None:
+        return cached[1], cached[2]
+
+    with _get_kb_load_lock(json_path):
+        # Another request may have loaded the file while we waited
+        cached = _get_cached_knowledge_base(json_path, signature)
+        if cached is not None:
+            return cached[1], cached[2]
+
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        except Exception:
+            with _kb_cache_lock:
+                if json_path not in _kb_cache:
+                    _kb_load_locks.pop(json_path, None)
+            raise
+
+        items_by_id = {}
+        if isinstance(items, list):
+            for item in items:
+                if isinstance(item, dict):
+                    items_by_id.setdefault(item.get('id'), item)
+
+        with _kb_cache_lock:
+            _kb_cache[json_path] = (signature, items, items_by_id)
+            _kb_cache.move_to_end(json_path)
+            while len(_kb_cache) > KB_CACHE_SIZE:
+                evicted_path = _kb_cache.popitem(last=False)[0]
+                _kb_load_locks.pop(evicted_path, None)
+    return items, items_by_id
+
+
+def invalidate_knowledge_base(json_path: str) -> None:
+    """
+    Drop the cached copy of a knowledge base file after the app has rewritten it.
+
+    The mtime/size check in load_knowledge_base can miss a rewrite that keeps the
+    file size and lands within the filesystem's timestamp resolution, so every
+    route that writes a knowledge base file calls this right after writing.
+    """
+    with _kb_cache_lock:
+        _kb_cache.pop(json_path, None)
+        _kb_load_locks.pop(json_path, None)
+
+
+# Engines kept alive between requests, keyed by (knowledge_file, state token).
+# The token is rotated in the session every time engine state is saved, so an
+# engine is only reused for the exact session state it was built from; stale
+# or unknown tokens fall back to rebuilding the engine from the session.
+ENGINE_POOL_SIZE = 32
+_engine_pool = OrderedDict()
+_engine_pool_lock = threading.Lock()
+
+
+def _pool_engine(knowledge_file: str, token: str, engine: SpacedRepetitionEngine) -> None:
+    """Put an engine into the pool, evicting the least recently used ones."""
+    with _engine_pool_lock:
+        _engine_pool[(knowledge_file, token)] = engine
+        _engine_pool.move_to_end((knowledge_file, token))
+        while len(_engine_pool) > ENGINE_POOL_SIZE:
+            _engine_pool.popitem(last=False)
+
+
+def _unpool_engine(knowledge_file: str):
+    """Take the engine matching the session's current state token out of the pool, if any."""
+    token = session.get(f'review_engine_token_{knowledge_file}')
+    if token is None:
+        return None
+    with _engine_pool_lock:
+        return _engine_pool.pop((knowledge_file, token), None)
+
+
+def _store_engine_state(knowledge_file: str, engine: SpacedRepetitionEngine) -> str:
+    """Write engine state to the session under a fresh token and return the token."""
+    token = secrets.token_hex(8)
+    session[f'review_engine_{knowledge_file}'] = engine.to_serializable()
+    session[f'review_engine_token_{knowledge_file}'] = token
+    return token
+
+
+def save_review_engine(knowledge_file: str, engine: SpacedRepetitionEngine) -> None:
+    """Save engine state to the session under a fresh token and pool the engine for reuse."""
+    token = _store_engine_state(knowledge_file, engine)
+    _pool_engine(knowledge_file, token, engine)
+
+
+def release_review_engine(knowledge_file: str, engine: SpacedRepetitionEngine) -> None:
+    """Return an engine whose session state was not changed to the pool."""
+    token = session.get(f'review_engine_token_{knowledge_file}')
+    if token is not None:
+        _pool_engine(knowledge_file, token, engine)
+
+
+def discard_review_engine(knowledge_file: str) -> None:
+    """Drop the pooled engine for the session's current state of a knowledge file."""
+    _unpool_engine(knowledge_file)
+
+
+def get_item_details(knowledge_file: str, item_id: str):
+    """Get id/question/answer for an item from the knowledge base, or None if not found."""
+    item = load_knowledge_base(knowledge_file)[1].get(item_id)
+    if item is None:
+        return None
+    return {
+        'id': item['id'],
+        'question': item['question'],
+        'answer': item['answer']
+    }
+
 
 def get_review_engine(knowledge_file: str, force_new: bool = False) -> SpacedRepetitionEngine:
     """
@@ -22,6 +180,10 @@ def get_review_engine(knowledge_file: str, force_new: bool = False) -> SpacedRep
 
     Retrieves engine state from Flask session if available and force_new is False,
     otherwise creates a new engine. Items are cached in session to avoid repeated file reads.
+
+    An engine pooled for the session's current state is reused instead of being
+    rebuilt. The caller owns the returned engine until it hands it back with
+    save_review_engine (state changed) or release_review_engine (unchanged).
     """
     items_key = f'review_items_{knowledge_file}'
     engine_key = f'review_engine_{knowledge_file}'
@@ -34,8 +196,7 @@ def get_review_engine(knowledge_file: str, force_new: bool = False) -> SpacedRep
         if not os.path.exists(json_path):
             raise FileNotFoundError(f"Knowledge base file not found: {json_path}")
 
-        with open(json_path, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
+        raw_data = load_knowledge_base(knowledge_file)[0]
 
         if not isinstance(raw_data, list):
             raise TypeError("JSON format error: Root element must be a list.")
@@ -66,12 +227,18 @@ def get_review_engine(knowledge_file: str, force_new: bool = False) -> SpacedRep
 
     # Check if we need to create new engine or restore from session
     if force_new or engine_key not in session:
+        discard_review_engine(knowledge_file)
         # Create fresh engine instance
         engine = SpacedRepetitionEngine()
         engine.initialize_from_items(items)
-        # Save initial state to session
-        session[engine_key] = engine.to_serializable()
+        # Save initial state to session; the caller pools the engine when it hands it back
+        _store_engine_state(knowledge_file, engine)
     else:
+        engine = _unpool_engine(knowledge_file)
+        if engine is not None:
+            # Pooled engine was already merged with the session's items
+            return engine
+
         # Restore engine from session
         engine_data = session[engine_key]
         engine = SpacedRepetitionEngine.from_serializable(engine_data)
@@ -101,24 +268,10 @@ def get_review_state():
 
         if next_item_id:
             # Get item details from knowledge base
-            knowledge_dir = current_app.config.get('KNOWLEDGE_DIR', 'D:\\knowledge_bases')
-            json_path = os.path.join(knowledge_dir, knowledge_file)
-
-            with open(json_path, 'r', encoding='utf-8') as f:
-                items = json.load(f)
-
-            for item in items:
-                if item.get('id') == next_item_id:
-                    next_item = {
-                        'id': item['id'],
-                        'question': item['question'],
-                        'answer': item['answer']
-                    }
-                    break
+            next_item = get_item_details(knowledge_file, next_item_id)
 
         progress = engine.get_progress()
-
-        return jsonify({
+        response = jsonify({
             "success": True,
             "next_item": next_item,
             "progress": progress,
@@ -127,6 +280,10 @@ def get_review_state():
             "total_items": engine.total_items_count
         })
 
+        # State was only read, keep the engine for the next request
+        release_review_engine(knowledge_file, engine)
+        return response
+
     except Exception as e:
         error_msg = f"Failed to get review state: {type(e).__name__}: {str(e)}"
         print(f"API Error in get_review_state: {repr(error_msg)}")
@@ -155,26 +312,12 @@ def handle_review_action():
         result = engine.handle_review_action(item_id, action)
 
         # Save updated engine state to session
-        engine_key = f'review_engine_{knowledge_file}'
-        session[engine_key] = engine.to_serializable()
+        save_review_engine(knowledge_file, engine)
 
         # Get next item details
         next_item = None
         if result['next_item_id']:
-            knowledge_dir = current_app.config.get('KNOWLEDGE_DIR', 'D:\\knowledge_bases')
-            json_path = os.path.join(knowledge_dir, knowledge_file)
-
-            with open(json_path, 'r', encoding='utf-8') as f:
-                items = json.load(f)
-
-            for item in items:
-                if item.get('id') == result['next_item_id']:
-                    next_item = {
-                        'id': item['id'],
-                        'question': item['question'],
-                        'answer': item['answer']
-                    }
-                    break
+            next_item = get_item_details(knowledge_file, result['next_item_id'])
 
         # Calculate statistics
         remaining_items = len(engine.dynamic_sequence)
@@ -222,7 +365,11 @@ def reset_review_state():
         # Clear session cache for this knowledge file
         items_key = f'review_items_{knowledge_file}'
         engine_key = f'review_engine_{knowledge_file}'
+        token_key = f'review_engine_token_{knowledge_file}'
 
+        discard_review_engine(knowledge_file)
+        if token_key in session:
+            del session[token_key]
         if items_key in session:
             del session[items_key]
         if engine_key in session:
@@ -253,33 +400,33 @@ def get_export_data():
         engine = get_review_engine(knowledge_file)
 
         # Load knowledge base to get question and answer text
-        knowledge_dir = current_app.config.get('KNOWLEDGE_DIR', 'D:\\knowledge_bases')
-        json_path = os.path.join(knowledge_dir, knowledge_file)
+        kb_items, kb_by_id = load_knowledge_base(knowledge_file)
+        empty_item = {}
 
-        with open(json_path, 'r', encoding='utf-8') as f:
-            kb_items = json.load(f)
+        # Create question map like original localStorage format, in knowledge base
+        # order (item_states order depends on how the engine was restored)
+        item_states = engine.item_states
+        ordered_ids = [item_id for item_id in kb_by_id if item_id in item_states]
+        ordered_ids.extend(item_id for item_id in item_states if item_id not in kb_by_id)
 
-        # Create question map like original localStorage format
         question_map = []
-        for item_id, state in engine.item_states.items():
+        for item_id in ordered_ids:
+            state = item_states[item_id]
             # Find question and answer from knowledge base
-            kb_item = next((item for item in kb_items if item.get('id') == item_id), None)
-            question = kb_item.get('question', '') if kb_item else ''
-            answer = kb_item.get('answer', '') if kb_item else ''
+            kb_item = kb_by_id.get(item_id, empty_item)
 
             # Create item data matching original format
-            item_data = {
+            question_map.append([item_id, {
                 'id': item_id,
-                'question': question,
-                'answer': answer,
+                'question': kb_item.get('question', ''),
+                'answer': kb_item.get('answer', ''),
                 '_reviewCount': state.review_count,
                 '_consecutiveCorrect': state.consecutive_correct,
                 '_learningStep': state.learning_step,
                 '_mastered': state.mastered,
                 '_wrongCount': state.wrong_count,
                 '_correctCount': state.correct_count
-            }
-            question_map.append([item_id, item_data])
+            }])
 
         # Calculate total items (from knowledge base, not just engine)
         total_items = len(kb_items)
@@ -288,7 +435,10 @@ def get_export_data():
         mastered_items = engine.mastered_items_count
 
         # Get dynamic sequence (only non-mastered items)
-        dynamic_sequence = engine.dynamic_sequence.copy()
+        dynamic_sequence = list(engine.dynamic_sequence)
+
+        # State was only read, keep the engine for the next request
+        release_review_engine(knowledge_file, engine)
 
         return jsonify({
             "success": True,
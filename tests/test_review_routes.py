@@ -0,0 +1,244 @@
+"""
+Tests for the knowledge base cache and engine pool in the review routes.
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from app import create_app
+from app.routes import review
+from app.algorithms.spaced_repetition import SpacedRepetitionEngine
+
+
+class ReviewRoutesTestCase(unittest.TestCase):
+    """Test client on a temporary knowledge directory, with the module caches emptied."""
+
+    def setUp(self):
+        self.knowledge_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.knowledge_dir)
+        self.app = create_app()
+        self.app.config['KNOWLEDGE_DIR'] = self.knowledge_dir
+        self.app.config['TESTING'] = True
+        self.client = self.app.test_client()
+        for table in (review._kb_cache, review._kb_load_locks, review._engine_pool):
+            table.clear()
+            self.addCleanup(table.clear)
+
+    def write_kb(self, file_name, items):
+        path = os.path.join(self.knowledge_dir, file_name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False, indent=2)
+        return path
+
+    def load_kb(self, file_name):
+        with self.app.app_context():
+            return review.load_knowledge_base(file_name)
+
+
+def make_items(count, with_ids=True):
+    items = [{'question': f'q{n}', 'answer': f'a{n}'} for n in range(count)]
+    if with_ids:
+        for n, item in enumerate(items):
+            item['id'] = f'id{n}'
+    return items
+
+
+class KnowledgeBaseCacheTests(ReviewRoutesTestCase):
+    """load_knowledge_base reuses parsed files and keeps at most KB_CACHE_SIZE of them."""
+
+    def test_unchanged_file_is_not_reparsed(self):
+        self.write_kb('kb.json', make_items(2))
+        self.assertIs(self.load_kb('kb.json')[0], self.load_kb('kb.json')[0])
+
+    def test_changed_file_is_reparsed(self):
+        self.write_kb('kb.json', make_items(2))
+        first = self.load_kb('kb.json')[0]
+        self.write_kb('kb.json', make_items(3))
+        second = self.load_kb('kb.json')[0]
+        self.assertIsNot(first, second)
+        self.assertEqual(len(second), 3)
+
+    def test_least_recently_used_file_is_evicted(self):
+        paths = {name: self.write_kb(name, make_items(1)) for name in ('a.json', 'b.json', 'c.json')}
+        with mock.patch.object(review, 'KB_CACHE_SIZE', 2):
+            first_a = self.load_kb('a.json')[0]
+            self.load_kb('b.json')
+            self.assertIs(self.load_kb('a.json')[0], first_a)  # hit, a becomes most recent
+            self.load_kb('c.json')
+        self.assertEqual(list(review._kb_cache), [paths['a.json'], paths['c.json']])
+        self.assertIs(self.load_kb('a.json')[0], first_a)
+
+
+class KnowledgeBaseLoadLockTests(ReviewRoutesTestCase):
+    """Concurrent misses parse a file once, and load locks never outlive cache entries."""
+
+    def test_concurrent_misses_parse_once(self):
+        self.write_kb('kb.json', make_items(50))
+        parses = []
+        real_load = json.load
+
+        def slow_load(f):
+            parses.append(f.name)
+            time.sleep(0.05)
+            return real_load(f)
+
+        barrier = threading.Barrier(8)
+        results = []
+
+        def load():
+            barrier.wait()
+            results.append(self.load_kb('kb.json')[0])
+
+        with mock.patch.object(review.json, 'load', side_effect=slow_load):
+            threads = [threading.Thread(target=load) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(parses), 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(items is results[0] for items in results))
+
+    def test_lock_table_stays_within_cache(self):
+        for n in range(5):
+            self.write_kb(f'kb{n}.json', make_items(1))
+        with open(os.path.join(self.knowledge_dir, 'broken.json'), 'w', encoding='utf-8') as f:
+            f.write('[')
+        with mock.patch.object(review, 'KB_CACHE_SIZE', 2):
+            for n in range(5):
+                self.load_kb(f'kb{n}.json')
+            with self.assertRaises(ValueError):
+                self.load_kb('broken.json')
+        self.assertEqual(len(review._kb_cache), 2)
+        self.assertLessEqual(set(review._kb_load_locks), set(review._kb_cache))
+
+
+class KnowledgeBaseInvalidationTests(ReviewRoutesTestCase):
+    """Every API route that rewrites a knowledge base file drops its cached copy."""
+
+    def test_update_item_is_seen_despite_unchanged_mtime_and_size(self):
+        path = self.write_kb('kb.json', make_items(2))
+        self.load_kb('kb.json')
+        before = os.stat(path)
+        response = self.client.post('/api/update-item', json={
+            'file_name': 'kb.json', 'item_id': 'id0', 'new_question': 'x0', 'new_answer': 'y0'})
+        self.assertTrue(response.get_json()['success'])
+        # Simulate a rewrite that lands within the filesystem's timestamp resolution
+        os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns))
+        self.assertEqual(os.stat(path).st_size, before.st_size)
+        self.assertEqual(self.load_kb('kb.json')[1]['id0']['question'], 'x0')
+
+    def test_write_routes_drop_cache_entry(self):
+        path = self.write_kb('kb.json', make_items(2, with_ids=False))
+        requests = [
+            ('/api/load', {'file_name': 'kb.json'}),
+            ('/api/save-all', {'file_name': 'kb.json', 'items': make_items(3)}),
+        ]
+        for url, payload in requests:
+            self.load_kb('kb.json')
+            self.assertIn(path, review._kb_cache)
+            response = self.client.post(url, json=payload)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertNotIn(path, review._kb_cache, url)
+            self.assertNotIn(path, review._kb_load_locks, url)
+
+    def test_create_drops_cache_entry_of_removed_file(self):
+        path = self.write_kb('new.json', make_items(1))
+        self.load_kb('new.json')
+        os.remove(path)
+        response = self.client.post('/api/create', json={'file_name': 'new.json'})
+        self.assertTrue(response.get_json()['success'])
+        self.assertNotIn(path, review._kb_cache)
+        self.assertEqual(self.load_kb('new.json')[0], [])
+
+
+class EnginePoolTests(ReviewRoutesTestCase):
+    """Pooled engines must behave exactly like engines rebuilt from the session."""
+
+    def setUp(self):
+        super().setUp()
+        self.write_kb('kb.json', make_items(25))
+        patcher = mock.patch.object(SpacedRepetitionEngine, 'from_serializable',
+                                    wraps=SpacedRepetitionEngine.from_serializable)
+        self.from_serializable = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def action(self, item_id, action):
+        return self.client.post('/api/review/action', json={
+            'file': 'kb.json', 'item_id': item_id, 'action': action}).get_json()
+
+    def pool_keys(self):
+        return list(review._engine_pool)
+
+    def session_token(self):
+        with self.client.session_transaction() as sess:
+            return sess['review_engine_token_kb.json']
+
+    def run_session(self):
+        random.seed(7)
+        responses = [self.client.get('/api/review/state?file=kb.json').get_json()]
+        next_item = responses[0]['next_item']
+        for step in range(40):
+            if not next_item:
+                break
+            response = self.action(next_item['id'], 'forgotten' if step % 3 == 0 else 'recognized')
+            responses.append(response)
+            next_item = response['next_item']
+            if step % 7 == 0:
+                responses.append(self.client.get('/api/review/state?file=kb.json').get_json())
+        responses.append(self.client.get('/api/review/export-data?file=kb.json').get_json())
+        return responses
+
+    def test_pool_hit_and_rebuild_give_same_responses(self):
+        pooled = self.run_session()
+        self.assertEqual(self.from_serializable.call_count, 0)
+
+        self.client = self.app.test_client()
+        review._engine_pool.clear()
+        with mock.patch.object(review, 'ENGINE_POOL_SIZE', 0):
+            rebuilt = self.run_session()
+        self.assertGreater(self.from_serializable.call_count, 0)
+        self.assertEqual(pooled, rebuilt)
+
+    def test_force_new_discards_pooled_engine(self):
+        self.client.get('/api/review/state?file=kb.json')
+        old_key = ('kb.json', self.session_token())
+        self.assertEqual(self.pool_keys(), [old_key])
+
+        self.client.get('/api/review/state?file=kb.json&new_session=true')
+        self.assertEqual(self.pool_keys(), [('kb.json', self.session_token())])
+        self.assertNotEqual(self.pool_keys(), [old_key])
+
+    def test_reset_discards_pooled_engine(self):
+        self.client.get('/api/review/state?file=kb.json')
+        self.assertEqual(len(self.pool_keys()), 1)
+        response = self.client.post('/api/review/reset', json={'file': 'kb.json'})
+        self.assertTrue(response.get_json()['success'])
+        self.assertEqual(self.pool_keys(), [])
+
+    def test_stale_token_rebuilds_from_session(self):
+        item_id = self.client.get('/api/review/state?file=kb.json').get_json()['next_item']['id']
+        with self.client.session_transaction() as sess:
+            old_session = dict(sess)
+        first = self.action(item_id, 'recognized')
+        self.assertEqual(self.from_serializable.call_count, 0)
+
+        # Replay the older cookie: its token has no pooled engine any more
+        with self.client.session_transaction() as sess:
+            sess.clear()
+            sess.update(old_session)
+        second = self.action(item_id, 'recognized')
+        self.assertEqual(self.from_serializable.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(second['total_mastered'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
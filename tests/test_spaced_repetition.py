@@ -0,0 +1,108 @@
+"""
+Regression tests for the spaced repetition engine.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from app.algorithms.spaced_repetition import SpacedRepetitionEngine
+
+
+def make_engine(count=3):
+    engine = SpacedRepetitionEngine()
+    engine.initialize_from_items([{'id': f'item{n}'} for n in range(count)])
+    return engine
+
+
+class SerializationTests(unittest.TestCase):
+    """Changes made through held ItemState references must show up in later serializations."""
+
+    def test_held_reference_change_is_serialized(self):
+        engine = make_engine()
+        state = engine.get_item_state('item0')
+        engine.to_serializable()
+        state.mastered = True
+        self.assertTrue(engine.to_serializable()['item_states']['item0']['mastered'])
+
+    def test_restored_item_change_is_serialized(self):
+        engine = SpacedRepetitionEngine.from_serializable(make_engine().to_serializable())
+        state = engine.item_states['item1']
+        engine.to_serializable()
+        state.review_count = 5
+        self.assertEqual(engine.to_serializable()['item_states']['item1']['review_count'], 5)
+
+    def test_action_result_state_change_is_serialized(self):
+        engine = make_engine()
+        item_id = engine.get_next_item()
+        state = engine.handle_review_action(item_id, 'forgotten')['updated_state']
+        engine.to_serializable()
+        state.wrong_count = 7
+        self.assertEqual(engine.to_serializable()['item_states'][item_id]['wrong_count'], 7)
+
+
+class ReviewActionTests(unittest.TestCase):
+    """handle_review_action must reject invalid input before changing any state."""
+
+    def test_invalid_action_leaves_state_unchanged(self):
+        engine = make_engine()
+        before = json.dumps(engine.to_serializable(), sort_keys=True)
+        with self.assertRaises(ValueError):
+            engine.handle_review_action('item0', 'skipped')
+        self.assertEqual(json.dumps(engine.to_serializable(), sort_keys=True), before)
+
+
+class SaveStateTests(unittest.TestCase):
+    """save_state must cope with its directory disappearing and clean up after failures."""
+
+    def test_save_state_recreates_removed_directory(self):
+        with tempfile.TemporaryDirectory() as root:
+            state_dir = os.path.join(root, 'state')
+            path = os.path.join(state_dir, 'state.json')
+            make_engine().save_state(path)
+            shutil.rmtree(state_dir)
+            make_engine().save_state(path)
+            self.assertTrue(os.path.exists(path))
+
+    def test_save_state_writes_held_reference_change_after_previous_save(self):
+        engine = make_engine()
+        state = engine.get_item_state('item2')
+        with tempfile.TemporaryDirectory() as state_dir:
+            path = os.path.join(state_dir, 'state.json')
+            engine.save_state(path)
+            state.wrong_count = 4
+            engine.save_state(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        self.assertEqual(saved['item_states']['item2']['wrong_count'], 4)
+
+    def test_failed_write_removes_temporary_file(self):
+        engine = make_engine()
+        with tempfile.TemporaryDirectory() as state_dir:
+            path = os.path.join(state_dir, 'state.json')
+            with mock.patch('os.replace', side_effect=OSError('disk full')):
+                with self.assertRaises(OSError):
+                    engine.save_state(path)
+            self.assertEqual(os.listdir(state_dir), [])
+
+    def test_failed_write_keeps_previous_state_file(self):
+        engine = make_engine()
+        with tempfile.TemporaryDirectory() as state_dir:
+            path = os.path.join(state_dir, 'state.json')
+            engine.save_state(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                before = f.read()
+            engine.handle_review_action(engine.get_next_item(), 'forgotten')
+            with mock.patch('os.fsync', side_effect=OSError('disk full')):
+                with self.assertRaises(OSError):
+                    engine.save_state(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                self.assertEqual(f.read(), before)
+            self.assertEqual(os.listdir(state_dir), ['state.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()